@@ -0,0 +1,897 @@
+import asyncio
+import importlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from itertools import accumulate
+from typing import Optional
+
+
+class _LazyModule:
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+httpx = _LazyModule("httpx")
+models = _LazyModule("cbr_client.models")
+transports = _LazyModule("cbr_client.transports")
+
+_LAZY_ATTRS = {
+    "Repository": "cbr_client.models",
+    "File": "cbr_client.models",
+    "Receipt": "cbr_client.models",
+    "Message": "cbr_client.models",
+    "Sender": "cbr_client.models",
+    "Task": "cbr_client.models",
+    "SupervisionDivision": "cbr_client.models",
+    "Activity": "cbr_client.models",
+    "Profile": "cbr_client.models",
+    "ProfileQuota": "cbr_client.models",
+    "Dictionary": "cbr_client.models",
+    "Error": "cbr_client.models",
+    "make_err": "cbr_client.models",
+    "RecordingTransport": "cbr_client.transports",
+    "ReplayTransport": "cbr_client.transports",
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_ATTRS[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_LAZY_ATTRS))
+
+
+_BASE_URL = "https://portal5.cbr.ru"
+_CHUNK_SIZE = 2**16
+_MIN_CHUNK_SIZE = 2**14
+_MAX_CHUNK_SIZE = 2**24
+_CHUNK_TIME = 1.0
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING_END = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r"[ \t\n\r,\]]")
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"')
+_BRACKETS = re.compile(r"[\[\]{}]")
+_DEPTH = {"[": 1, "{": 1, "]": -1, "}": -1}
+_MCHD = re.compile(r"^DOVER_CBR_(?:\d{10}|\d{12})_\d{8}_.{1,10}.[xX][mM][lL]$")
+
+_deadline = ContextVar("deadline", default=None)
+
+logger = logging.getLogger("cbr-client")
+logger.setLevel("DEBUG")
+
+
+tasks = {
+    "1-ПИ": "Zadacha_61",
+    "1-ИЦБ": "Zadacha_98",
+    "1-АРЕНДА": "Zadacha_98",
+    "1-ПОЕЗДКИ": "Zadacha_98",
+    "1-РОУМИНГ": "Zadacha_98",
+    "1-ТРАНСПОРТ": "Zadacha_98",
+    "2-ТРАНСПОРТ": "Zadacha_98",
+    "3-ТРАНСПОРТ": "Zadacha_98",
+    "1-МЕД": "Zadacha_98",
+}
+
+type_map = {
+    "sig": "Sign",
+    "xml": "SerializedWebForm",
+    "poa": "PowerOfAttorney",
+}
+
+
+class ClientException(Exception):
+    def __init__(
+        self,
+        status: Optional[int] = 418,
+        error_code: Optional[str] = "I_AM_A_TEAPOT",
+        error_message: Optional[str] = None,
+        more_info: Optional[dict] = None,
+    ):
+        self.status = status
+        self.error_code = error_code
+        self.error_message = error_message
+        self.more_info = more_info
+
+    def __repr__(self):
+        return (
+            f"ClientException(status={self.status}, "
+            f'error_code="{self.error_code}", '
+            f'error_message="{self.error_message}", '
+            f"more_info={self.more_info})"
+        )
+
+    def __str__(self):
+        return f"{self.status} {self.error_message}"
+
+
+class _ByteBudget:
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.used = 0
+        self._cond = None
+
+    @asynccontextmanager
+    async def hold(self, size):
+        if self.limit is None:
+            yield
+            return
+        size = min(size, self.limit)
+        if self._cond is None:
+            self._cond = asyncio.Condition()
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.used + size <= self.limit)
+            self.used += size
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self.used -= size
+                self._cond.notify_all()
+
+
+class _ArrayDecoder:
+    def __init__(self):
+        self.started = False
+        self.closed = False
+        self.expect_item = True
+        self.comma = False
+        self.in_item = False
+        self.parts = []
+        self.depth = 0
+        self.scalar = False
+        self.in_string = False
+        self.escape = False
+
+    @staticmethod
+    def _expect(char, expected, text, pos):
+        if char != expected:
+            raise json.JSONDecodeError(f"Expecting '{expected}'", text, pos)
+
+    def _scan_string(self, text, pos):
+        if self.escape:
+            if pos >= len(text):
+                return None
+            self.escape = False
+            pos += 1
+        match = _STRING_END.search(text, pos)
+        if match is None:
+            return None
+        if match.group() == "\\":
+            self.escape = True
+        else:
+            self.in_string = False
+        return match.end()
+
+    def _skip(self, text, pos):
+        segment = _STRING.sub("", text[pos:])
+        quote = segment.find('"')
+        if quote >= 0:
+            segment = segment[:quote]
+        brackets = _BRACKETS.findall(segment)
+        depths = list(accumulate(map(_DEPTH.__getitem__, brackets)))
+        if depths and self.depth + min(depths) <= 0:
+            return False
+        self.depth += depths[-1] if depths else 0
+        if quote >= 0:
+            self.in_string = True
+            self.escape = (len(text) - len(text.rstrip("\\"))) % 2 == 1
+        return True
+
+    def _finish(self, items, item, end):
+        items.append(item)
+        self.parts = []
+        self.depth = 0
+        self.in_item = self.scalar = self.in_string = self.escape = False
+        self.expect_item = self.comma = False
+        return end
+
+    def _feed_scalar(self, text, pos, items):
+        match = _SCALAR_END.search(text, pos)
+        if match is None:
+            self.parts.append(text[pos:])
+            return len(text)
+        self.parts.append(text[pos : match.start()])
+        item = _decoder.decode("".join(self.parts))
+        return self._finish(items, item, match.start())
+
+    def _feed_item(self, text, pos, items):
+        if self.scalar:
+            return self._feed_scalar(text, pos, items)
+        if not self.parts:
+            try:
+                item, end = _decoder.raw_decode(text, pos)
+            except json.JSONDecodeError:
+                if not self._skip(text, pos):
+                    raise
+                self.parts.append(text[pos:])
+                return len(text)
+            return self._finish(items, item, end)
+        start = pos
+        while self.in_string and pos is not None:
+            pos = self._scan_string(text, pos)
+        if pos is None or self.depth and self._skip(text, pos):
+            self.parts.append(text[start:])
+            return len(text)
+        prefix = "".join(self.parts)
+        item, end = _decoder.raw_decode(prefix + text[start:])
+        return self._finish(items, item, end - len(prefix) + start)
+
+    def feed(self, text, final=False):
+        items = []
+        pos = 0
+        while pos < len(text) and not self.closed:
+            if self.in_item:
+                pos = self._feed_item(text, pos, items)
+                continue
+            pos = _WHITESPACE.match(text, pos).end()
+            if pos == len(text):
+                break
+            char = text[pos]
+            if not self.started:
+                self._expect(char, "[", text, pos)
+                self.started = True
+            elif char == "]" and not self.comma:
+                self.closed = True
+            elif not self.expect_item:
+                self._expect(char, ",", text, pos)
+                self.expect_item = self.comma = True
+            else:
+                self.in_item = True
+                self.scalar = char not in '[{"'
+                continue
+            pos += 1
+        if final and not self.closed:
+            raise json.JSONDecodeError("Unterminated array", text, pos)
+        return items
+
+
+async def _iter_json_array(chunks):
+    decoder = _ArrayDecoder()
+    async for chunk in chunks:
+        for item in decoder.feed(chunk):
+            yield item
+    decoder.feed("", final=True)
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        failures: int = 5,
+        error_rate: float = 0.5,
+        window: int = 20,
+        reset_timeout: float = 30.0,
+    ):
+        self.failures = failures
+        self.error_rate = error_rate
+        self.window = window
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.opened_at = None
+        self._consecutive = 0
+        self._results = deque(maxlen=window)
+
+    def copy(self):
+        return CircuitBreaker(
+            failures=self.failures,
+            error_rate=self.error_rate,
+            window=self.window,
+            reset_timeout=self.reset_timeout,
+        )
+
+    @property
+    def expired(self):
+        if self.state != "open":
+            return False
+        return time.monotonic() - self.opened_at >= self.reset_timeout
+
+    def open(self):
+        self.state = "open"
+        self.opened_at = time.monotonic()
+
+    def close(self):
+        self.state = "closed"
+        self.opened_at = None
+        self._consecutive = 0
+        self._results.clear()
+
+    def record(self, ok):
+        if self.state == "open":
+            return
+        self._results.append(ok)
+        if ok:
+            self._consecutive = 0
+            if self.state != "closed":
+                self.close()
+            return
+        self._consecutive += 1
+        rate = self._results.count(False) / len(self._results)
+        if (
+            self.state == "half_open"
+            or self._consecutive >= self.failures
+            or len(self._results) == self.window
+            and rate >= self.error_rate
+        ):
+            self.open()
+
+
+class Client:
+    def __init__(
+        self,
+        *,
+        login: str,
+        password: str,
+        url: str = None,
+        user_agent: str = None,
+        timeout: float = 5.0,
+        api_version: str = "v2",
+        min_chunk_size: int = _MIN_CHUNK_SIZE,
+        max_chunk_size: int = _MAX_CHUNK_SIZE,
+        coalesce: bool = True,
+        max_inflight_bytes: Optional[int] = None,
+        release_content: bool = False,
+        spool_dir: Optional[str] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        transport: Optional["httpx.AsyncBaseTransport"] = None,
+        record: Optional[str] = None,
+    ):
+        headers = {"Accept": "application/json"}
+        if user_agent:
+            headers.update({"User-Agent": user_agent})
+        if api_version not in ("v1", "v2"):
+            raise ClientException(
+                error_message="Значение api_version должно быть v1 или v2"
+            )
+        if not 0 < min_chunk_size <= max_chunk_size:
+            raise ClientException(
+                error_message="Некорректные границы размера чанка"
+            )
+        self.api_version = api_version
+        self.timeout = timeout
+        self.min_chunk_size = min_chunk_size
+        self.max_chunk_size = max_chunk_size
+        self._chunk_sizes = {}
+        self._chunk_ceilings = {}
+        self.coalesce = coalesce
+        self._inflight = {}
+        self.budget = _ByteBudget(max_inflight_bytes)
+        self.release_content = release_content
+        self.spool_dir = spool_dir
+        self.circuit_breaker = circuit_breaker
+        self._breakers = {}
+        self.prefix = "/back/rapi2"
+        if not url:
+            url = _BASE_URL
+        if record:
+            transport = transports.RecordingTransport(record, transport)
+        if not all((login, password)):
+            raise ClientException(
+                error_message="Логин и пароль являются обязательными"
+            )
+        self._client = None
+        self._closed = False
+        self._client_params = {
+            "base_url": url,
+            "headers": headers,
+            "auth": (login, password),
+            "transport": transport,
+        }
+
+    @property
+    def client(self):
+        if self._client is None:
+            if self._closed:
+                raise RuntimeError(
+                    "Cannot send a request, as the client has been closed."
+                )
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(timeout=self.timeout),
+                **self._client_params,
+            )
+        return self._client
+
+    @property
+    def is_closed(self):
+        if self._client is None:
+            return self._closed
+        return self._client.is_closed
+
+    @staticmethod
+    def _deadline_exceeded():
+        return ClientException(
+            status=408,
+            error_code="DEADLINE_EXCEEDED",
+            error_message="Превышено время выполнения операции",
+        )
+
+    @asynccontextmanager
+    async def deadline(self, timeout: Optional[float]):
+        if timeout is None:
+            yield
+            return
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        expires = loop.time() + timeout
+        outer = _deadline.get()
+        if outer is not None and outer <= expires:
+            yield
+            return
+        token = _deadline.set(expires)
+        expired = []
+
+        def expire():
+            expired.append(True)
+            task.cancel()
+
+        handle = loop.call_at(expires, expire)
+        try:
+            yield
+        except asyncio.CancelledError:
+            if not expired:
+                raise
+            if hasattr(task, "uncancel"):
+                task.uncancel()
+            raise self._deadline_exceeded()
+        finally:
+            handle.cancel()
+            _deadline.reset(token)
+
+    def _remaining(self):
+        expires = _deadline.get()
+        if expires is None:
+            return None
+        remaining = expires - asyncio.get_running_loop().time()
+        if remaining <= 0:
+            raise self._deadline_exceeded()
+        return min(remaining, self.timeout)
+
+    @staticmethod
+    def _get_filetype(name):
+        head, tail = name.partition(".")[0], name.rpartition(".")[2]
+        if head.startswith("DOVER_CBR") and tail != "sig":
+            tail = "poa"
+            if not _MCHD.match(name):
+                raise ClientException(
+                    error_message=f"Имя файла {name} не соответствует шаблону"
+                )
+        return type_map.get(tail, "Document")
+
+    @staticmethod
+    def _get_signed(name, files=()):
+        if name.endswith(".sig"):
+            signed = name[:-4]
+            head, _, tail = signed.rpartition(".")
+            if head and tail.isdigit() and signed not in files:
+                signed = head
+            return f"{signed}.enc" if signed.endswith(".zip") else signed
+
+    @staticmethod
+    def _index_files(files):
+        index = {}
+        for f in files:
+            if f[0] in index:
+                raise ClientException(
+                    error_message=f"Файл {f[0]} указан более одного раза"
+                )
+            index[f[0]] = f
+        return index
+
+    def _set_payload(self, form, title, text, files):
+        if form not in tasks:
+            raise ClientException(
+                error_message=f"Неизвестный тип задачи {form}"
+            )
+        payload = {
+            "Task": tasks[form],
+            "Title": title or f"Отчет {form}",
+            "Text": text,
+            "Files": [],
+        }
+        for name, f in files.items():
+            filetype = f[2] if len(f) == 3 else self._get_filetype(name)
+            signed = self._get_signed(name, files)
+            if signed is not None and signed not in files:
+                raise ClientException(
+                    error_message=f"Для подписи {name} не найден файл {signed}"
+                )
+            data = {
+                "Name": name,
+                "Encrypted": name.endswith(".enc", -4),
+                "Size": len(f[1]),
+                "FileType": filetype,
+                "SignedFile": signed,
+                "ReposytoryType": "http",
+            }
+            payload["Files"].append(data)
+        return payload
+
+    @staticmethod
+    def _update_json(json, files):
+        if not isinstance(files, dict):
+            files = {f[0]: f for f in files}
+        for rf in json["Files"]:
+            f = files.get(rf["Name"])
+            if f is not None:
+                rf["Content"] = f[1]
+        return json
+
+    @staticmethod
+    def _upload_headers(index, offset, total):
+        return {
+            "Content-Type": "application/octet-stream",
+            "Content-Length": str(offset),
+            "Content-Range": f"bytes {index}-{index + offset - 1}/{total}",
+        }
+
+    def _clamp_chunk_size(self, size, ceiling=None):
+        size = min(max(size, self.min_chunk_size), self.max_chunk_size)
+        return size if ceiling is None else min(size, ceiling)
+
+    def _next_chunk_size(self, size, elapsed, ceiling=None):
+        if elapsed < _CHUNK_TIME / 2:
+            size *= 2
+        elif elapsed > _CHUNK_TIME * 2:
+            size //= 2
+        return self._clamp_chunk_size(size, ceiling)
+
+    async def _adaptive_upload(self, f, chunk_size):
+        host = self.client.base_url.host
+        ceiling = self._chunk_ceilings.get(host)
+        size = self._chunk_sizes.get(host, chunk_size)
+        size = self._clamp_chunk_size(size, ceiling)
+        best, best_rate = size, 0.0
+        total = len(f.content)
+        index = 0
+        resp = None
+        while index < total:
+            chunk = f.content[index : index + size]
+            hdrs = self._upload_headers(index, len(chunk), total)
+            start = time.monotonic()
+            try:
+                resp = await self._request(
+                    method="PUT", url=f.upload_url, headers=hdrs, content=chunk
+                )
+            except (httpx.TimeoutException, ClientException) as exc:
+                rejected = isinstance(exc, ClientException)
+                if (
+                    size <= self.min_chunk_size
+                    or rejected
+                    and exc.status != 413
+                ):
+                    raise
+                size = self._clamp_chunk_size(size // 2, ceiling)
+                if rejected:
+                    ceiling = self._chunk_ceilings[host] = size
+                logger.debug(f"chunk size decreased to {size} ({exc!r})")
+                continue
+            elapsed = time.monotonic() - start
+            rate = len(chunk) / elapsed if elapsed else float("inf")
+            if len(chunk) == size and rate > best_rate:
+                best, best_rate = size, rate
+            index += len(chunk)
+            size = self._next_chunk_size(size, elapsed, ceiling)
+        self._chunk_sizes[host] = self._clamp_chunk_size(best, ceiling)
+        return resp
+
+    async def _partial_upload(self, f, chunk_size, adaptive=False):
+        if not f.content or len(f.content) == 0:
+            raise ClientException(
+                error_message="Загружаемый файл должен иметь ненулевой размер"
+            )
+        if adaptive:
+            return await self._adaptive_upload(f, chunk_size)
+        resp = None
+        for i in range(0, len(f.content), chunk_size):
+            chunk = f.content[i : i + chunk_size]
+            hdrs = self._upload_headers(i, len(chunk), len(f.content))
+            resp = await self._request(
+                method="PUT", url=f.upload_url, headers=hdrs, content=chunk
+            )
+        return resp
+
+    @staticmethod
+    def is_json(resp):
+        return "application/json" in resp.headers.get("content-type", "")
+
+    async def _request(self, method, url, **kwargs):
+        if not url.startswith(self.prefix):
+            url = f"{self.prefix}/{self.api_version}" + url
+        if (
+            self.coalesce
+            and method == "GET"
+            and set(kwargs) <= {"params"}
+            and _deadline.get() is None
+        ):
+            params = str(httpx.QueryParams(kwargs.get("params")))
+            resp = await self._coalesced((method, url, params), **kwargs)
+            return self._parse(resp)
+        return self._parse(await self._send(method, url, **kwargs))
+
+    async def _coalesced(self, key, **kwargs):
+        entry = self._inflight.get(key)
+        if entry is None:
+            task = asyncio.ensure_future(self._send(*key[:2], **kwargs))
+            entry = self._inflight[key] = [task, 0]
+            task.add_done_callback(lambda _: self._forget(key, entry))
+        task = entry[0]
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task)
+        except ClientException as exc:
+            raise ClientException(**vars(exc)) from None
+        finally:
+            entry[1] -= 1
+            if not entry[1] and not task.done():
+                task.cancel()
+                self._forget(key, entry)
+
+    def _forget(self, key, entry):
+        if self._inflight.get(key) is entry:
+            del self._inflight[key]
+
+    def _endpoint(self, url):
+        path = url.split("?", 1)[0].split("/")
+        parts = [
+            p for p in path if p and p not in ("back", "rapi2", "v1", "v2")
+        ]
+        if "files" in parts:
+            return "files"
+        return parts[0] if parts else "/"
+
+    def circuit_state(self):
+        return {name: b.state for name, b in self._breakers.items()}
+
+    async def _probe(self):
+        url = f"{self.prefix}/{self.api_version}/profile"
+        try:
+            resp = await self.client.request("GET", url)
+        except httpx.TransportError:
+            return False
+        return resp.status_code < 500
+
+    async def _check_breaker(self, endpoint):
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            breaker = self._breakers[endpoint] = self.circuit_breaker.copy()
+        if breaker.expired:
+            breaker.state = "half_open"
+            try:
+                ok = await self._probe()
+            except BaseException:
+                breaker.open()
+                raise
+            if ok:
+                breaker.close()
+            else:
+                breaker.open()
+        if breaker.state != "closed":
+            raise ClientException(
+                status=503,
+                error_code="CIRCUIT_OPEN",
+                error_message=f"Запросы к {endpoint} временно отклоняются",
+            )
+        return breaker
+
+    async def _guard(self, url):
+        if self.circuit_breaker is not None:
+            return await self._check_breaker(self._endpoint(url))
+
+    @staticmethod
+    def _record(breaker, ok):
+        if breaker is not None:
+            breaker.record(ok)
+
+    def _raise_for_status(self, resp):
+        try:
+            resp.raise_for_status()
+        except httpx.HTTPStatusError as exc:
+            if self.is_json(resp):
+                err = models.Error(**resp.json())
+            else:
+                err = models.make_err(exc)
+            logger.debug(err)
+            raise ClientException(**err.dict())
+
+    async def _send(self, method, url, **kwargs):
+        timeout = self._remaining()
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        breaker = await self._guard(url)
+        try:
+            resp = await self.client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            self._record(breaker, False)
+            raise
+        self._record(breaker, resp.status_code < 500)
+        logger.debug(f"{method} {url} {resp.status_code}")
+        self._raise_for_status(resp)
+        return resp
+
+    def _parse(self, resp):
+        return resp.json() if self.is_json(resp) else resp.content
+
+    @asynccontextmanager
+    async def _stream(self, method, url, **kwargs):
+        if not url.startswith(self.prefix):
+            url = f"{self.prefix}/{self.api_version}" + url
+        timeout = self._remaining()
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        breaker = await self._guard(url)
+        try:
+            async with self.client.stream(method, url, **kwargs) as resp:
+                logger.debug(f"{method} {url} {resp.status_code}")
+                if resp.is_error:
+                    await resp.aread()
+                    self._record(breaker, resp.status_code < 500)
+                    self._raise_for_status(resp)
+                yield resp
+        except httpx.TransportError:
+            self._record(breaker, False)
+            raise
+        self._record(breaker, True)
+
+    async def _stream_array(self, url, **kwargs):
+        async with self._stream("GET", url, **kwargs) as resp:
+            async for item in _iter_json_array(resp.aiter_text()):
+                yield item
+
+    async def get_tasks(self):
+        resp = await self._request("GET", "/tasks")
+        return [models.Task(**item) for item in resp]
+
+    async def get_profile(self):
+        resp = await self._request("GET", "/profile")
+        return models.Profile(**resp)
+
+    async def get_profile_quota(self):
+        resp = await self._request("GET", "/profile/quota")
+        return models.ProfileQuota(**resp)
+
+    async def get_dictionaries(self):
+        resp = await self._request("GET", "/dictionaries")
+        return [models.Dictionary(**dictionary) for dictionary in resp]
+
+    async def get_dictionary(self, oid):
+        return await self._request("GET", f"/dictionaries/{oid}")
+
+    async def create_message(self, files, form, title=None, text=None):
+        files = self._index_files(files)
+        payload = self._set_payload(form, title, text, files)
+        resp = await self._request("POST", "/messages", json=payload)
+        json = self._update_json(resp, files)
+        return models.Message(**json)
+
+    def _spill(self, prefix, content):
+        fd, path = tempfile.mkstemp(prefix=prefix, dir=self.spool_dir)
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(content)
+        return path
+
+    async def _release(self, f, drop):
+        if self.spool_dir and f.content is not None:
+            prefix = f"{f.oid}_" if f.oid else "cbr_"
+            loop = asyncio.get_running_loop()
+            f.path = await loop.run_in_executor(
+                None, self._spill, prefix, f.content
+            )
+            f.content = None
+        elif drop:
+            f.content = None
+
+    async def upload(
+        self,
+        f,
+        chunked=False,
+        chunk_size=_CHUNK_SIZE,
+        adaptive=False,
+        deadline=None,
+    ):
+        if f.content is None:
+            raise ClientException(
+                error_message=f"Содержимое файла {f.name} не загружено"
+            )
+        size = len(f.content)
+        async with self.deadline(deadline), self.budget.hold(size):
+            await self._request("POST", f.session_url)
+            if chunked or adaptive:
+                resp = await self._partial_upload(f, chunk_size, adaptive)
+            else:
+                hdr = self._upload_headers(0, len(f.content), len(f.content))
+                resp = await self._request(
+                    method="PUT",
+                    url=f.upload_url,
+                    content=f.content,
+                    headers=hdr,
+                )
+            await self._release(f, self.release_content)
+        return models.File(**resp)
+
+    async def finalize_message(self, msg):
+        return await self._request("POST", f"/messages/{msg.oid}")
+
+    async def get_receipts(self, msg_id):
+        receipts = await self._request("GET", f"/messages/{msg_id}/receipts")
+        return [models.Receipt(**meta) for meta in receipts]
+
+    async def iter_receipts(self, msg_id):
+        url = f"/messages/{msg_id}/receipts"
+        async for meta in self._stream_array(url):
+            yield models.Receipt(**meta)
+
+    async def download(self, f):
+        async with self.budget.hold(f.size):
+            async with self._stream("GET", f.download_url) as resp:
+                length = resp.headers.get("Content-Length", 0)
+                size = 0 if f.size else int(length)
+                async with self.budget.hold(size):
+                    await resp.aread()
+                    f.content = self._parse(resp)
+                    await self._release(f, False)
+
+    @staticmethod
+    def _messages_params(form, msg_type, status, page):
+        params = {"Page": page}
+        if form:
+            params["Task"] = tasks.get(form)
+        if msg_type:
+            params["Type"] = msg_type
+        if status:
+            params["Status"] = status
+        return params
+
+    async def get_messages(
+        self,
+        form: Optional[str] = None,
+        msg_type: Optional[str] = None,
+        status: Optional[str] = None,
+        page: int = 1,
+    ):
+        params = self._messages_params(form, msg_type, status, page)
+        messages = await self._request("GET", "/messages", params=params)
+        return [models.Message(**msg) for msg in messages]
+
+    async def iter_messages(
+        self,
+        form: Optional[str] = None,
+        msg_type: Optional[str] = None,
+        status: Optional[str] = None,
+        page: int = 1,
+    ):
+        params = self._messages_params(form, msg_type, status, page)
+        async for msg in self._stream_array("/messages", params=params):
+            yield models.Message(**msg)
+
+    async def delete_message(self, msg_id):
+        return await self._request("DELETE", f"/messages/{msg_id}")
+
+    async def close(self):
+        self._closed = True
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+
+    async def __aenter__(self):
+        await self.client.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._closed = True
+        await self.client.__aexit__(exc_type, exc_val, exc_tb)
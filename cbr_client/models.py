@@ -0,0 +1,145 @@
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class Repository(BaseModel):
+    type: str = Field(alias="RepositoryType", default=None)
+    host: str = Field(alias="Host", default=None)
+    port: int = Field(alias="Port", default=None)
+    path: str = Field(alias="Path", default=None)
+
+
+class File(BaseModel):
+    name: str = Field(alias="Name", default=None)
+    content: bytes = Field(alias="Content", default=None, repr=False)
+    path: str = None
+    size: int = Field(alias="Size", default=0)
+    encrypted: bool = Field(alias="Encrypted", default=False)
+    filetype: str = Field(alias="FileType", default=None)
+    signed_file: str = Field(alias="SignedFile", default=None)
+    description: str = Field(alias="Description", default=None)
+    oid: UUID = Field(alias="Id", default=None)
+    repository: List[Repository] = Field(
+        alias="RepositoryInfo", default_factory=list
+    )
+
+    @property
+    def upload_url(self):
+        path = self.repository[0].path.rsplit("/", 1)[0]
+        return path if path.startswith("/") else f"/{path}"
+
+    @property
+    def session_url(self):
+        return f"{self.upload_url}/createUploadSession"
+
+    @property
+    def download_url(self):
+        return f"{self.upload_url}/download"
+
+
+class Receipt(BaseModel):
+    oid: UUID = Field(alias="Id", default=None)
+    receive_time: datetime = Field(alias="ReceiveTime", default=None)
+    status_time: datetime = Field(alias="StatusTime", default=None)
+    status: str = Field(alias="Status", default=None)
+    message: str = Field(alias="Message", default=None)
+    files: List[File] = Field(alias="Files", default_factory=list)
+
+
+class Message(BaseModel):
+    files: List[File] = Field(alias="Files", default_factory=list)
+    form: str = None
+    oid: UUID = Field(alias="Id", default=None)
+    corr_id: UUID = Field(alias="CorrelationId", default=None)
+    group_id: UUID = Field(alias="GroupId", default=None)
+    title: str = None
+    text: str = None
+    created: datetime = Field(alias="CreationDate", default=None)
+    updated: datetime = Field(alias="UpdatedDate", default=None)
+    status: str = Field(alias="Status", default=None)
+    task: str = None
+    regnum: str = Field(alias="RegNumber", default=None)
+    size: int = Field(alias="TotalSize", default=0)
+    receipts: List[Receipt] = Field(alias="Receipts", default_factory=list)
+
+
+class Sender(BaseModel):
+    inn: str = Field(alias="Inn", default=None)
+    ogrn: str = Field(alias="Ogrn", default=None)
+    bik: str = Field(alias="Bik", default=None)
+    regnum: str = Field(alias="RegNum", default=None)
+    division_code: str = Field(alias="DivisionCode", default=None)
+
+
+class Task(BaseModel):
+    code: str = Field(alias="Code", default=None)
+    name: str = Field(alias="Name", default=None)
+    description: str = Field(alias="Description", default=None)
+    direction: str = Field(alias="Direction", default=None)
+    allow_aspera: bool = Field(alias="AllowAspera", default=False)
+    allow_linked_messages: bool = Field(
+        alias="AllowLinkedMessages", default=False
+    )
+
+
+class SupervisionDivision(BaseModel):
+    name: str = Field(alias="Name", default=None)
+
+
+class Activity(BaseModel):
+    short_name: str = Field(alias="ShortName", default=None)
+    full_name: str = Field(alias="FullName", default=None)
+    supervision_division: SupervisionDivision = Field(
+        alias="SupervisionDevision"
+    )
+
+
+class Profile(BaseModel):
+    short_name: str = Field(alias="ShortName", default=None)
+    full_name: str = Field(alias="FullName", default=None)
+    activities: List[Activity] = Field(alias="Activities", default=None)
+    inn: str = Field(alias="Inn", default=None)
+    ogrn: str = Field(alias="Ogrn", default=None)
+    international_id: str = Field(alias="InternationalId", default=None)
+    opf: str = Field(alias="Opf", default=None)
+    email: str = Field(alias="Email", default=None)
+    address: str = Field(alias="Address", default=None)
+    phone: str = Field(alias="Phone", default=None)
+    created: datetime = Field(alias="CreationDate", default=None)
+    status: str = Field(alias="Status", default=None)
+
+
+class ProfileQuota(BaseModel):
+    total: int = Field(alias="TotalQuota", default=0)
+    used: int = Field(alias="UsedQuota", default=0)
+    msg_size: int = Field(alias="MessageSize", default=0)
+
+
+class Dictionary(BaseModel):
+    oid: UUID = Field(alias="Id")
+    text: str = Field(alias="Text")
+    date: datetime = Field(alias="Date")
+
+
+class Error(BaseModel):
+    status: int = Field(alias="HTTPStatus")
+    error_code: str = Field(alias="ErrorCode")
+    error_message: str = Field(alias="ErrorMessage")
+    more_info: Optional[dict] = Field(alias="MoreInfo")
+
+
+def make_err(exc: "httpx.HTTPStatusError"):
+    return Error(
+        **{
+            "HTTPStatus": exc.response.status_code,
+            "ErrorCode": "INCORRECT_RESPONSE_CONTENT",
+            "ErrorMessage": exc.response.reason_phrase,
+            "MoreInfo": None,
+        }
+    )
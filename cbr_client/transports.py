@@ -0,0 +1,148 @@
+import asyncio
+import base64
+import json
+import tempfile
+import time
+from collections import deque
+
+import httpx
+
+_SPOOL_SIZE = 3 * 2**16
+
+
+class _RecordedStream(httpx.AsyncByteStream):
+    def __init__(self, stream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+        self._body = tempfile.SpooledTemporaryFile(max_size=_SPOOL_SIZE)
+        self._finished = time.monotonic()
+        self._closed = False
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            self._body.write(chunk)
+            self._finished = time.monotonic()
+            yield chunk
+
+    async def aclose(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            await self._stream.aclose()
+        finally:
+            await self._on_close(self._body, self._finished)
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    hidden_headers = (
+        "authorization",
+        "cookie",
+        "proxy-authorization",
+        "set-cookie",
+    )
+
+    def __init__(self, path, transport=None):
+        self.path = path
+        self.transport = transport or httpx.AsyncHTTPTransport()
+        self._journal = None
+        self._lock = None
+
+    def _headers(self, headers):
+        return [
+            (k, v)
+            for k, v in headers.multi_items()
+            if k.lower() not in self.hidden_headers
+        ]
+
+    def _write(self, entry, body=None):
+        if self._journal is None:
+            self._journal = open(self.path, "a", encoding="utf-8")
+        line = json.dumps(entry, separators=(",", ":"))
+        if body is None:
+            self._journal.write(line + "\n")
+        else:
+            with body:
+                self._journal.write(line[:-1] + ',"content":"')
+                body.seek(0)
+                for chunk in iter(lambda: body.read(_SPOOL_SIZE), b""):
+                    self._journal.write(base64.b64encode(chunk).decode())
+                self._journal.write('"}\n')
+        self._journal.flush()
+
+    async def _save(self, entry, body=None):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            await loop.run_in_executor(None, self._write, entry, body)
+
+    async def handle_async_request(self, request):
+        body = await request.aread()
+        entry = {
+            "method": request.method,
+            "url": str(request.url),
+            "headers": self._headers(request.headers),
+            "request_size": len(body),
+        }
+        start = time.monotonic()
+        try:
+            response = await self.transport.handle_async_request(request)
+        except httpx.TransportError as exc:
+            entry["error"] = type(exc).__name__
+            entry["message"] = str(exc)
+            entry["elapsed"] = round(time.monotonic() - start, 6)
+            await self._save(entry)
+            raise
+        entry["status"] = response.status_code
+        entry["response_headers"] = self._headers(response.headers)
+
+        async def on_close(content, finished):
+            entry["response_size"] = content.tell()
+            entry["elapsed"] = round(finished - start, 6)
+            await self._save(entry, content)
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_RecordedStream(response.stream, on_close),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self):
+        if self._lock is not None:
+            async with self._lock:
+                if self._journal is not None:
+                    self._journal.close()
+                    self._journal = None
+        await self.transport.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    def __init__(self, path, time_scale: float = 1.0):
+        self.time_scale = time_scale
+        self._entries = {}
+        with open(path, encoding="utf-8") as journal:
+            for line in journal:
+                entry = json.loads(line)
+                key = (entry["method"], entry["url"])
+                self._entries.setdefault(key, deque()).append(entry)
+
+    async def handle_async_request(self, request):
+        queue = self._entries.get((request.method, str(request.url)))
+        if not queue:
+            raise httpx.ConnectError(
+                f"Нет записанного ответа для {request.method} {request.url}",
+                request=request,
+            )
+        entry = queue.popleft() if len(queue) > 1 else queue[0]
+        if self.time_scale:
+            await asyncio.sleep(entry["elapsed"] * self.time_scale)
+        if "error" in entry:
+            error = getattr(httpx, entry["error"], httpx.TransportError)
+            raise error(entry["message"], request=request)
+        return httpx.Response(
+            status_code=entry["status"],
+            headers=entry["response_headers"],
+            content=base64.b64decode(entry["content"]),
+        )
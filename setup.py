@@ -15,7 +15,6 @@ setup(
     author_email="animal2k@gmail.com",
     license="MIT",
     license_file="LICENSE",
-    py_modules=["cbr_client"],
     install_requires=["httpx", "pydantic"],
     url="https://github.com/mrslow/cbr-client",
     keywords="cbr rest api client",
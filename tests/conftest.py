@@ -2,7 +2,7 @@ import json
 
 import pytest
 
-from cbr_client import Client
+from cbr_client import Client, File
 
 base_headers = {"Accept": "application/json", "User-Agent": "pytest"}
 base_url = "https://portal5test.cbr.ru"
@@ -37,3 +37,29 @@ async def invalid_client():
     )
     yield c
     await c.close()
+
+
+@pytest.fixture
+def upload_file():
+    file_data = messages_json[0]["Files"][0]
+    f = File(**file_data)
+    f.content = b"report data"
+    yield f, file_data
+
+
+def add_upload_responses(httpx_mock, f, data):
+    sdata = {"UploadUrl": "/", "ExpirationDateTime": "2021-01-01 00:00:00"}
+    httpx_mock.add_response(
+        status_code=200,
+        json=sdata,
+        headers={"Content-Type": "application/json"},
+        method="POST",
+        url=f"{base_url}{f.session_url}",
+    )
+    httpx_mock.add_response(
+        status_code=201,
+        json=data,
+        headers={"Content-Type": "application/json"},
+        method="PUT",
+        url=f"{base_url}{f.upload_url}",
+    )
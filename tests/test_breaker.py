@@ -0,0 +1,162 @@
+import asyncio
+
+import httpx
+import pytest
+from conftest import base_url, profile_json
+
+from cbr_client import CircuitBreaker, Client, ClientException
+
+profile_url = f"{base_url}/back/rapi2/v2/profile"
+messages_url = f"{base_url}/back/rapi2/v2/messages?Page=1"
+
+
+def raise_timeout(request):
+    raise httpx.ReadTimeout("Test timeout error", request=request)
+
+
+@pytest.fixture
+async def breaker_client():
+    c = Client(
+        url=base_url,
+        login="test",
+        password="123",
+        circuit_breaker=CircuitBreaker(failures=2, reset_timeout=60),
+    )
+    yield c
+    await c.close()
+
+
+@pytest.mark.asyncio
+async def test_breaker_opens(httpx_mock, breaker_client):
+    httpx_mock.add_callback(raise_timeout, url=messages_url)
+    for _ in range(2):
+        with pytest.raises(httpx.ReadTimeout):
+            await breaker_client.get_messages()
+    with pytest.raises(ClientException) as exc:
+        await breaker_client.get_messages()
+    assert exc.value.status == 503
+    assert exc.value.error_code == "CIRCUIT_OPEN"
+    assert len(httpx_mock.get_requests()) == 2
+    assert breaker_client.circuit_state() == {"messages": "open"}
+
+
+@pytest.mark.asyncio
+async def test_breaker_per_endpoint(httpx_mock, breaker_client):
+    httpx_mock.add_response(status_code=502, url=messages_url)
+    httpx_mock.add_response(json=profile_json, url=profile_url)
+    for _ in range(2):
+        with pytest.raises(ClientException):
+            await breaker_client.get_messages()
+    await breaker_client.get_profile()
+    assert breaker_client.circuit_state() == {
+        "messages": "open",
+        "profile": "closed",
+    }
+
+
+@pytest.mark.asyncio
+async def test_breaker_ignores_client_errors(httpx_mock, breaker_client):
+    httpx_mock.add_response(status_code=404, url=messages_url)
+    for _ in range(3):
+        with pytest.raises(ClientException) as exc:
+            await breaker_client.get_messages()
+        assert exc.value.status == 404
+    assert breaker_client.circuit_state() == {"messages": "closed"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "probe_status,state", ((200, "closed"), (503, "open"))
+)
+async def test_breaker_probe(httpx_mock, breaker_client, probe_status, state):
+    httpx_mock.add_response(status_code=502, url=messages_url)
+    httpx_mock.add_response(
+        status_code=probe_status, json=profile_json, url=profile_url
+    )
+    for _ in range(2):
+        with pytest.raises(ClientException):
+            await breaker_client.get_messages()
+    breaker_client._breakers["messages"].opened_at -= 60
+    with pytest.raises(ClientException) as exc:
+        await breaker_client.get_messages()
+    assert exc.value.error_code == (
+        "INCORRECT_RESPONSE_CONTENT" if state == "closed" else "CIRCUIT_OPEN"
+    )
+    assert breaker_client.circuit_state()["messages"] == (
+        "closed" if state == "closed" else "open"
+    )
+    assert len(httpx_mock.get_requests(url=profile_url)) == 1
+
+
+@pytest.mark.asyncio
+async def test_breaker_probe_timeout(httpx_mock, breaker_client):
+    httpx_mock.add_callback(raise_timeout)
+    for _ in range(2):
+        with pytest.raises(httpx.ReadTimeout):
+            await breaker_client.get_tasks()
+    breaker_client._breakers["tasks"].opened_at -= 60
+    with pytest.raises(ClientException) as exc:
+        await breaker_client.get_tasks()
+    assert exc.value.error_code == "CIRCUIT_OPEN"
+    assert breaker_client.circuit_state() == {"tasks": "open"}
+
+
+def test_breaker_error_rate():
+    breaker = CircuitBreaker(failures=10, error_rate=0.5, window=4)
+    for ok in (True, False, True):
+        breaker.record(ok)
+    assert breaker.state == "closed"
+    breaker.record(False)
+    assert breaker.state == "open"
+    assert breaker.copy().state == "closed"
+    breaker.state = "half_open"
+    breaker.record(True)
+    assert breaker.state == "closed"
+    breaker.state = "half_open"
+    breaker.record(False)
+    assert breaker.state == "open"
+
+
+def test_breaker_ignores_results_while_open():
+    breaker = CircuitBreaker(failures=2)
+    breaker.record(False)
+    breaker.record(False)
+    opened_at = breaker.opened_at
+    breaker.record(True)
+    breaker.record(False)
+    assert breaker.state == "open"
+    assert breaker.opened_at == opened_at
+    assert list(breaker._results) == [False, False]
+
+
+def test_endpoint(client):
+    assert client._endpoint("/back/rapi2/v2/messages/1/receipts") == "messages"
+    assert client._endpoint("/back/rapi2/messages/1/files/2") == "files"
+    assert client._endpoint("/back/rapi2/v2") == "/"
+
+
+@pytest.mark.asyncio
+async def test_breaker_probe_cancelled(httpx_mock, breaker_client):
+    probes = []
+
+    async def respond(request):
+        if request.url.path.endswith("profile"):
+            probes.append(request)
+            if len(probes) == 1:
+                await asyncio.sleep(1)
+            return httpx.Response(status_code=200, json=profile_json)
+        return httpx.Response(status_code=200, json=[])
+
+    httpx_mock.add_callback(respond)
+    breaker = breaker_client._breakers["tasks"] = CircuitBreaker(failures=2)
+    breaker.open()
+    breaker.opened_at -= 60
+    with pytest.raises(ClientException) as exc:
+        async with breaker_client.deadline(0.05):
+            await breaker_client.get_tasks()
+    assert exc.value.error_code == "DEADLINE_EXCEEDED"
+    await asyncio.sleep(0)
+    assert breaker_client.circuit_state() == {"tasks": "open"}
+    breaker.opened_at -= 60
+    assert await breaker_client.get_tasks() == []
+    assert breaker_client.circuit_state() == {"tasks": "closed"}
@@ -0,0 +1,161 @@
+import asyncio
+import os
+
+import pytest
+from conftest import add_upload_responses, base_url
+
+from cbr_client import Client, ClientException, File, _ByteBudget
+
+
+@pytest.mark.asyncio
+async def test_budget_waits_for_release():
+    budget = _ByteBudget(10)
+    order = []
+    done = {name: asyncio.Event() for name in "abc"}
+
+    async def hold(name, size):
+        async with budget.hold(size):
+            order.append(name)
+            await done[name].wait()
+            order.append(name)
+
+    async def settle():
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    holders = asyncio.gather(hold("a", 8), hold("b", 5), hold("c", 2))
+    await settle()
+    assert order == ["a", "c"]
+    done["a"].set()
+    done["c"].set()
+    await settle()
+    done["b"].set()
+    await holders
+    assert order == ["a", "c", "a", "c", "b", "b"]
+    assert budget.used == 0
+
+
+@pytest.mark.asyncio
+async def test_budget_larger_than_limit():
+    budget = _ByteBudget(10)
+    async with budget.hold(100):
+        assert budget.used == 10
+    assert budget.used == 0
+
+
+@pytest.mark.asyncio
+async def test_budget_unlimited():
+    budget = _ByteBudget()
+    async with budget.hold(100):
+        assert budget.used == 0
+
+
+@pytest.mark.asyncio
+async def test_upload_release_content(httpx_mock, upload_file):
+    f, data = upload_file
+    add_upload_responses(httpx_mock, f, data)
+    async with Client(
+        url=base_url,
+        login="test",
+        password="123",
+        max_inflight_bytes=4,
+        release_content=True,
+    ) as client:
+        await client.upload(f)
+        assert client.budget.used == 0
+    assert f.content is None
+    assert f.path is None
+
+
+@pytest.mark.asyncio
+async def test_upload_released_content(httpx_mock, upload_file):
+    f, data = upload_file
+    add_upload_responses(httpx_mock, f, data)
+    async with Client(
+        url=base_url, login="test", password="123", release_content=True
+    ) as client:
+        await client.upload(f)
+        with pytest.raises(ClientException) as exc:
+            await client.upload(f)
+    assert exc.value.error_message == f"Содержимое файла {f.name} не загружено"
+
+
+@pytest.mark.asyncio
+async def test_upload_spool(httpx_mock, upload_file, tmp_path):
+    f, data = upload_file
+    add_upload_responses(httpx_mock, f, data)
+    async with Client(
+        url=base_url, login="test", password="123", spool_dir=str(tmp_path)
+    ) as client:
+        await client.upload(f)
+    assert f.content is None
+    assert os.path.dirname(f.path) == str(tmp_path)
+    assert os.path.basename(f.path).startswith(f"{f.oid}_")
+    assert open(f.path, "rb").read() == b"report data"
+
+
+@pytest.mark.asyncio
+async def test_download_spool(httpx_mock, tmp_path):
+    files = [
+        File(
+            Name="a.xml",
+            Size=4,
+            RepositoryInfo=[{"Path": "/back/rapi2/files/a/c"}],
+        ),
+        File(
+            Name="a.xml",
+            Size=4,
+            RepositoryInfo=[{"Path": "/back/rapi2/files/b/c"}],
+        ),
+    ]
+    httpx_mock.add_response(
+        status_code=200,
+        content=b"test",
+        headers={"Content-Type": "application/octet-stream"},
+        method="GET",
+        url=f"{base_url}/back/rapi2/files/a/download",
+    )
+    httpx_mock.add_response(
+        status_code=200,
+        content=b"other",
+        headers={"Content-Type": "application/octet-stream"},
+        method="GET",
+        url=f"{base_url}/back/rapi2/files/b/download",
+    )
+    async with Client(
+        url=base_url, login="test", password="123", spool_dir=str(tmp_path)
+    ) as client:
+        for f in files:
+            await client.download(f)
+    assert all(f.content is None for f in files)
+    assert files[0].path != files[1].path
+    assert os.path.dirname(files[0].path) == str(tmp_path)
+    assert open(files[0].path, "rb").read() == b"test"
+    assert open(files[1].path, "rb").read() == b"other"
+
+
+@pytest.mark.asyncio
+async def test_download_without_size(httpx_mock):
+    f = File(Name="a.xml", RepositoryInfo=[{"Path": "/back/rapi2/files/a/c"}])
+    httpx_mock.add_response(
+        status_code=200,
+        content=b"test",
+        headers={"Content-Type": "application/octet-stream"},
+        method="GET",
+        url=f"{base_url}/back/rapi2/files/a/download",
+    )
+    async with Client(
+        url=base_url, login="test", password="123", max_inflight_bytes=10
+    ) as client:
+        used = []
+        release = client._release
+
+        async def spy(f, drop):
+            used.append(client.budget.used)
+            await release(f, drop)
+
+        client._release = spy
+        await client.download(f)
+        assert client.budget.used == 0
+    assert used == [4]
+    assert f.content == b"test"
@@ -124,3 +124,23 @@ def test_exception_repr():
         'error_message="Аккаунт не найден", more_info={})'
     )
     assert str(exc) == "401 Аккаунт не найден"
+
+
+@pytest.mark.asyncio
+async def test_close_unused_client():
+    client = Client(url=base_url, login="test", password="test")
+    assert not client.is_closed
+    await client.close()
+    assert client.is_closed
+    with pytest.raises(RuntimeError):
+        await client.get_profile()
+
+
+@pytest.mark.asyncio
+async def test_close_used_client(httpx_mock, client):
+    httpx_mock.add_response(json=[])
+    await client.get_tasks()
+    await client.close()
+    assert client.is_closed
+    with pytest.raises(RuntimeError):
+        await client.get_tasks()
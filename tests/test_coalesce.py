@@ -0,0 +1,122 @@
+import asyncio
+
+import httpx
+import pytest
+from conftest import base_url, messages_json, profile_json
+
+from cbr_client import Client, ClientException, File, Profile
+
+profile_url = f"{base_url}/back/rapi2/v2/profile"
+
+
+def slow_response(status_code=200, json=None):
+    async def respond(request):
+        await asyncio.sleep(0.01)
+        return httpx.Response(status_code=status_code, json=json)
+
+    return respond
+
+
+@pytest.mark.asyncio
+async def test_coalesce_get(httpx_mock, client):
+    httpx_mock.add_callback(slow_response(json=profile_json))
+    first, second = await asyncio.gather(
+        client.get_profile(), client.get_profile()
+    )
+    assert isinstance(first, Profile)
+    assert first == second
+    assert len(httpx_mock.get_requests()) == 1
+    assert not client._inflight
+
+
+@pytest.mark.asyncio
+async def test_coalesce_different_params(httpx_mock, client):
+    httpx_mock.add_callback(slow_response(json=[]))
+    await asyncio.gather(
+        client.get_messages(page=1), client.get_messages(page=2)
+    )
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.asyncio
+async def test_coalesce_disabled(httpx_mock):
+    httpx_mock.add_callback(slow_response(json=profile_json))
+    async with Client(
+        url=base_url, login="test", password="123", coalesce=False
+    ) as client:
+        await asyncio.gather(client.get_profile(), client.get_profile())
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.asyncio
+async def test_coalesce_error(httpx_mock, client):
+    httpx_mock.add_callback(slow_response(status_code=502))
+    results = await asyncio.gather(
+        client.get_profile(), client.get_profile(), return_exceptions=True
+    )
+    assert all(isinstance(r, ClientException) for r in results)
+    assert all(r.status == 502 for r in results)
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_coalesce_cancel_one(httpx_mock, client):
+    httpx_mock.add_callback(slow_response(json=profile_json))
+    cancelled = asyncio.ensure_future(client.get_profile())
+    waiting = asyncio.ensure_future(client.get_profile())
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    assert isinstance(await waiting, Profile)
+    assert cancelled.cancelled()
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_coalesce_cancel_all(httpx_mock, client):
+    httpx_mock.add_callback(slow_response(json=profile_json))
+    waiter = asyncio.ensure_future(client.get_profile())
+    await asyncio.sleep(0)
+    task, _ = next(iter(client._inflight.values()))
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert not client._inflight
+    await asyncio.sleep(0)
+    assert task.cancelled()
+
+
+@pytest.mark.asyncio
+async def test_coalesce_independent_results(httpx_mock, client):
+    httpx_mock.add_callback(slow_response(json={"a": [1]}))
+    first, second = await asyncio.gather(
+        client.get_dictionary("1"), client.get_dictionary("1")
+    )
+    first["a"].append(2)
+    assert second == {"a": [1]}
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_coalesce_error_per_waiter(httpx_mock, client):
+    httpx_mock.add_callback(slow_response(status_code=502))
+    first, second = await asyncio.gather(
+        client.get_profile(), client.get_profile(), return_exceptions=True
+    )
+    assert first is not second
+    assert first.__cause__ is None and first.__suppress_context__
+    assert (first.status, first.error_code) == (502, second.error_code)
+
+
+@pytest.mark.asyncio
+async def test_download_not_coalesced(httpx_mock, client):
+    data = messages_json[0]["Files"][0]
+    first, second = File(**data), File(**data)
+
+    async def respond(request):
+        await asyncio.sleep(0.01)
+        return httpx.Response(status_code=200, content=b"data")
+
+    httpx_mock.add_callback(respond)
+    await asyncio.gather(client.download(first), client.download(second))
+    assert first.content == second.content == b"data"
+    assert len(httpx_mock.get_requests()) == 2
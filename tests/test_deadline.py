@@ -0,0 +1,128 @@
+import asyncio
+
+import httpx
+import pytest
+from conftest import base_url, profile_json
+
+from cbr_client import ClientException
+
+
+def assert_deadline(exc):
+    assert exc.value.status == 408
+    assert exc.value.error_code == "DEADLINE_EXCEEDED"
+
+
+@pytest.mark.asyncio
+async def test_deadline_request_timeout(httpx_mock, client):
+    timeouts = []
+
+    def respond(request):
+        timeouts.append(request.extensions["timeout"]["read"])
+        if request.url.path.endswith("receipts"):
+            return httpx.Response(status_code=200, json=[])
+        return httpx.Response(status_code=200, json=profile_json)
+
+    httpx_mock.add_callback(respond)
+    async with client.deadline(1.0):
+        await client.get_profile()
+        async with client.deadline(10.0):
+            await client.get_profile_quota()
+            async for _ in client.iter_receipts("1"):
+                pass
+    await client.get_profile()
+    assert all(0 < t <= 1.0 for t in timeouts[:3])
+    assert timeouts[3] == 5.0
+
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_operation(httpx_mock, client):
+    async def respond(request):
+        await asyncio.sleep(1)
+        return httpx.Response(status_code=200, json=profile_json)
+
+    httpx_mock.add_callback(respond)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    with pytest.raises(ClientException) as exc:
+        async with client.deadline(0.05):
+            await client.get_profile()
+    assert loop.time() - start < 0.5
+    assert_deadline(exc)
+
+
+@pytest.mark.asyncio
+async def test_deadline_exhausted(httpx_mock, client):
+    with pytest.raises(ClientException) as exc:
+        async with client.deadline(0.01):
+            await asyncio.sleep(0.02)
+    assert_deadline(exc)
+    with pytest.raises(ClientException) as exc:
+        async with client.deadline(0):
+            await client.get_profile()
+    assert_deadline(exc)
+    assert not httpx_mock.get_requests()
+
+
+@pytest.mark.asyncio
+async def test_deadline_outer_cancel(client):
+    async def work():
+        async with client.deadline(10):
+            await asyncio.sleep(1)
+
+    task = asyncio.ensure_future(work())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+@pytest.mark.asyncio
+async def test_upload_deadline(httpx_mock, client, upload_file):
+    f, data = upload_file
+    slow = []
+
+    async def delay(request):
+        slow.append(request)
+        await asyncio.sleep(0.03)
+        return httpx.Response(status_code=201, json=data)
+
+    httpx_mock.add_response(method="POST", url=f"{base_url}{f.session_url}")
+    httpx_mock.add_callback(delay, method="PUT")
+    with pytest.raises(ClientException) as exc:
+        await client.upload(f, chunked=True, chunk_size=1, deadline=0.1)
+    assert_deadline(exc)
+    assert 0 < len(slow) < len(f.content)
+
+
+@pytest.mark.asyncio
+async def test_deadline_nested_outer_expires(client):
+    with pytest.raises(ClientException) as exc:
+        async with client.deadline(0.02):
+            async with client.deadline(10):
+                await asyncio.sleep(1)
+    assert_deadline(exc)
+    task = asyncio.current_task()
+    if hasattr(task, "cancelling"):
+        assert task.cancelling() == 0
+    await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_deadline_not_coalesced(httpx_mock, client):
+    timeouts = []
+
+    async def respond(request):
+        timeouts.append(request.extensions["timeout"]["read"])
+        await asyncio.sleep(0.01)
+        return httpx.Response(status_code=200, json=profile_json)
+
+    httpx_mock.add_callback(respond)
+
+    async def with_deadline():
+        async with client.deadline(1.0):
+            return await client.get_profile()
+
+    await asyncio.gather(with_deadline(), client.get_profile())
+    assert len(timeouts) == 2
+    assert sorted(timeouts)[0] <= 1.0
+    assert sorted(timeouts)[1] == 5.0
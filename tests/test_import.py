@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+import pytest
+
+import cbr_client
+
+heavy_modules = (
+    "httpx",
+    "pydantic",
+    "cbr_client.models",
+    "cbr_client.transports",
+)
+
+cold_start = f"""
+import sys
+import time
+
+start = time.perf_counter()
+import cbr_client
+
+cbr_client.Client(login="test", password="test")
+elapsed = time.perf_counter() - start
+loaded = [m for m in {heavy_modules!r} if m in sys.modules]
+print(elapsed, *loaded)
+"""
+
+heavy_import = f"""
+import time
+
+start = time.perf_counter()
+import {", ".join(heavy_modules)}
+
+print(time.perf_counter() - start)
+"""
+
+
+def run(code):
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    return out.stdout.split()
+
+
+def test_cold_start():
+    elapsed, *loaded = run(cold_start)
+    assert loaded == []
+    assert float(elapsed) < float(run(heavy_import)[0])
+
+
+def test_lazy_attributes():
+    assert cbr_client.File is cbr_client.models.File
+    assert "ReplayTransport" in dir(cbr_client)
+    with pytest.raises(AttributeError):
+        cbr_client.Unknown
@@ -1,7 +1,13 @@
+import httpx
 import pytest
-from conftest import base_url, correct_headers, messages_json
+from conftest import (
+    add_upload_responses,
+    base_url,
+    correct_headers,
+    messages_json,
+)
 
-from cbr_client import ClientException, File, Message
+from cbr_client import Client, ClientException, Message
 
 upload_files = [
     ("test_report.zip.enc", b"report data"),
@@ -16,14 +22,6 @@ upload_files = [
 download_files = []
 
 
-@pytest.fixture
-def upload_file():
-    file_data = messages_json[0]["Files"][0]
-    f = File(**file_data)
-    f.content = b"report data"
-    yield f, file_data
-
-
 @pytest.mark.asyncio
 async def test_create_message(httpx_mock, client):
     httpx_mock.add_response(
@@ -113,3 +111,200 @@ async def test_get_messages(httpx_mock, client):
     )
     assert isinstance(resp, list)
     assert isinstance(resp[0], Message)
+
+
+@pytest.fixture
+def adaptive_client(client):
+    client.min_chunk_size = 4
+    client.max_chunk_size = 32
+    yield client
+
+
+def put_ranges(httpx_mock):
+    return [
+        r.headers["Content-Range"]
+        for r in httpx_mock.get_requests()
+        if r.method == "PUT"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_upload_adaptive(httpx_mock, adaptive_client, upload_file):
+    f, data = upload_file
+    f.content = b"x" * 100
+    add_upload_responses(httpx_mock, f, data)
+    resp = await adaptive_client.upload(f, adaptive=True, chunk_size=8)
+    assert f.name == resp.name
+    assert put_ranges(httpx_mock) == [
+        "bytes 0-7/100",
+        "bytes 8-23/100",
+        "bytes 24-55/100",
+        "bytes 56-87/100",
+        "bytes 88-99/100",
+    ]
+    assert adaptive_client._chunk_sizes["portal5test.cbr.ru"] == 32
+
+
+@pytest.mark.asyncio
+async def test_upload_adaptive_remembers_size(
+    httpx_mock, adaptive_client, upload_file
+):
+    f, data = upload_file
+    adaptive_client._chunk_sizes["portal5test.cbr.ru"] = 32
+    add_upload_responses(httpx_mock, f, data)
+    await adaptive_client.upload(f, adaptive=True, chunk_size=4)
+    assert put_ranges(httpx_mock) == ["bytes 0-10/11"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", (None, 413))
+async def test_upload_adaptive_backoff(
+    httpx_mock, adaptive_client, upload_file, status
+):
+    f, data = upload_file
+    failed = []
+
+    def fail_once(request):
+        if failed:
+            return httpx.Response(status_code=201, json=data)
+        failed.append(request)
+        if status is None:
+            raise httpx.ReadTimeout("Test timeout error", request=request)
+        return httpx.Response(status_code=status)
+
+    httpx_mock.add_callback(fail_once, method="PUT")
+    await adaptive_client._partial_upload(f, chunk_size=16, adaptive=True)
+    assert put_ranges(httpx_mock) == [
+        "bytes 0-10/11",
+        "bytes 0-7/11",
+        "bytes 8-10/11",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_upload_adaptive_min_size(
+    httpx_mock, adaptive_client, upload_file
+):
+    f, _ = upload_file
+    httpx_mock.add_response(status_code=413, method="PUT")
+    with pytest.raises(ClientException) as exc:
+        await adaptive_client._partial_upload(f, chunk_size=4, adaptive=True)
+    assert exc.value.status == 413
+    assert len(httpx_mock.get_requests()) == 1
+
+
+@pytest.mark.asyncio
+async def test_upload_adaptive_ceiling(
+    httpx_mock, adaptive_client, upload_file
+):
+    f, data = upload_file
+    f.content = b"x" * 100
+    statuses = []
+
+    def limit(request):
+        size = len(request.content)
+        if size > 16:
+            statuses.append((413, size))
+            return httpx.Response(status_code=413)
+        statuses.append((201, size))
+        return httpx.Response(status_code=201, json=data)
+
+    httpx_mock.add_callback(limit, method="PUT")
+    await adaptive_client._partial_upload(f, chunk_size=8, adaptive=True)
+    assert statuses[:3] == [(201, 8), (201, 16), (413, 32)]
+    assert [s for s in statuses if s[0] == 413] == [(413, 32)]
+    assert adaptive_client._chunk_sizes["portal5test.cbr.ru"] == 16
+    assert adaptive_client._chunk_ceilings["portal5test.cbr.ru"] == 16
+
+    statuses.clear()
+    await adaptive_client._partial_upload(f, chunk_size=8, adaptive=True)
+    assert {s[0] for s in statuses} == {201}
+    assert statuses[0] == (201, 16)
+
+
+def test_client_invalid_chunk_bounds():
+    with pytest.raises(ClientException) as exc:
+        Client(
+            url=base_url,
+            login="test",
+            password="test",
+            min_chunk_size=8,
+            max_chunk_size=4,
+        )
+    assert exc.value.error_message == "Некорректные границы размера чанка"
+
+
+@pytest.mark.parametrize(
+    "elapsed,expected", ((0.1, 32), (1.0, 16), (3.0, 8), (100.0, 8))
+)
+def test_next_chunk_size(adaptive_client, elapsed, expected):
+    assert adaptive_client._next_chunk_size(16, elapsed) == expected
+
+
+@pytest.mark.asyncio
+async def test_create_message_duplicate(client):
+    files = upload_files[:3] + upload_files[1:2]
+    with pytest.raises(ClientException) as exc:
+        await client.create_message(files, "1-ПИ")
+    err = "Файл test_report.zip.1.sig указан более одного раза"
+    assert exc.value.error_message == err
+
+
+@pytest.mark.asyncio
+async def test_create_message_orphan_sign(client):
+    with pytest.raises(ClientException) as exc:
+        await client.create_message(upload_files[1:3], "1-ПИ")
+    err = (
+        "Для подписи test_report.zip.1.sig не найден файл test_report.zip.enc"
+    )
+    assert exc.value.error_message == err
+
+
+def test_set_payload(client):
+    files = client._index_files(upload_files[:5])
+    payload = client._set_payload("1-ПИ", None, None, files)
+    assert [f["FileType"] for f in payload["Files"]] == [
+        "Document",
+        "Sign",
+        "Sign",
+        "PowerOfAttorney",
+        "Sign",
+    ]
+    assert [f["SignedFile"] for f in payload["Files"]] == [
+        None,
+        "test_report.zip.enc",
+        "test_report.zip.enc",
+        None,
+        "DOVER_CBR_1234567890_20000101_1.xml",
+    ]
+
+
+@pytest.mark.parametrize(
+    "name,signed",
+    (
+        ("report.v2.xml.sig", "report.v2.xml"),
+        ("report.v2.zip.3.sig", "report.v2.zip.enc"),
+        ("report.zip.enc.sig", "report.zip.enc"),
+        ("report.v2.xml", None),
+    ),
+)
+def test_get_signed(client, name, signed):
+    assert client._get_signed(name) == signed
+
+
+def test_set_payload_multi_dot(client):
+    files = client._index_files(
+        [
+            ("report.v2.xml", b"data"),
+            ("report.v2.xml.sig", b"sign"),
+            ("data.001", b"data"),
+            ("data.001.sig", b"sign"),
+        ]
+    )
+    payload = client._set_payload("1-ПИ", None, None, files)
+    assert [f["SignedFile"] for f in payload["Files"]] == [
+        None,
+        "report.v2.xml",
+        None,
+        "data.001",
+    ]
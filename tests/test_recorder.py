@@ -0,0 +1,224 @@
+import asyncio
+import base64
+import json
+import threading
+
+import httpx
+import pytest
+from conftest import base_url, messages_json, profile_json
+
+from cbr_client import (
+    Client,
+    ClientException,
+    Message,
+    Profile,
+    ReplayTransport,
+)
+from cbr_client.transports import _RecordedStream
+
+
+@pytest.fixture
+def journal(tmp_path):
+    yield tmp_path / "journal.jsonl"
+
+
+def portal(request):
+    if request.method == "DELETE":
+        return httpx.Response(
+            status_code=404,
+            json={
+                "HTTPStatus": 404,
+                "ErrorCode": "NOT_FOUND",
+                "ErrorMessage": "Не найдено",
+                "MoreInfo": {},
+            },
+        )
+    if request.url.path.endswith("profile"):
+        return httpx.Response(
+            status_code=200,
+            json=profile_json,
+            headers={"Set-Cookie": "session=secret"},
+        )
+    return httpx.Response(status_code=200, json=messages_json)
+
+
+def recording_client(journal):
+    return Client(
+        url=base_url,
+        login="test",
+        password="123",
+        transport=httpx.MockTransport(portal),
+        record=str(journal),
+    )
+
+
+@pytest.mark.asyncio
+async def test_record(journal):
+    async with recording_client(journal) as client:
+        profile = await client.get_profile()
+    assert isinstance(profile, Profile)
+    (entry,) = [json.loads(line) for line in journal.read_text().splitlines()]
+    assert entry["method"] == "GET"
+    assert entry["url"] == f"{base_url}/back/rapi2/v2/profile"
+    assert entry["status"] == 200
+    assert entry["request_size"] == 0
+    assert entry["response_size"] > 0
+    assert entry["elapsed"] >= 0
+    assert "authorization" not in dict(entry["headers"])
+    assert dict(entry["headers"])["accept"] == "application/json"
+    assert "secret" not in journal.read_text()
+
+
+@pytest.mark.asyncio
+async def test_record_hides_cookies(journal):
+    async with recording_client(journal) as client:
+        client.client.cookies.set("session", "secret")
+        await client.get_profile()
+    (entry,) = [json.loads(line) for line in journal.read_text().splitlines()]
+    assert "cookie" not in dict(entry["headers"])
+    assert "set-cookie" not in dict(entry["response_headers"])
+    assert "secret" not in journal.read_text()
+
+
+@pytest.mark.asyncio
+async def test_record_streams_response(journal):
+    raw = json.dumps(messages_json).encode()
+    more = asyncio.Event()
+
+    class Stream(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield raw[:-1]
+            await more.wait()
+            yield raw[-1:]
+
+    def respond(request):
+        return httpx.Response(
+            status_code=200,
+            headers={"Content-Type": "application/json"},
+            stream=Stream(),
+        )
+
+    async with Client(
+        url=base_url,
+        login="test",
+        password="123",
+        transport=httpx.MockTransport(respond),
+        record=str(journal),
+    ) as client:
+        messages = client.iter_messages()
+        first = await asyncio.wait_for(messages.__anext__(), 1)
+        assert isinstance(first, Message)
+        assert not journal.exists()
+        more.set()
+        rest = [m async for m in messages]
+    assert [first, *rest] == [Message(**m) for m in messages_json]
+    (entry,) = [json.loads(line) for line in journal.read_text().splitlines()]
+    assert entry["response_size"] == len(raw)
+    assert json.loads(base64.b64decode(entry["content"])) == messages_json
+
+
+@pytest.mark.asyncio
+async def test_record_writes_off_loop(journal):
+    threads = []
+    async with recording_client(journal) as client:
+        transport = client.client._transport
+        write = transport._write
+
+        def spy(entry, body=None):
+            threads.append(threading.get_ident())
+            write(entry, body)
+
+        transport._write = spy
+        await client.get_profile()
+    assert threads and threading.get_ident() not in threads
+    assert len(journal.read_text().splitlines()) == 1
+
+
+@pytest.mark.asyncio
+async def test_record_transport_error(journal):
+    def timeout(request):
+        raise httpx.ReadTimeout("Test timeout error", request=request)
+
+    async with Client(
+        url=base_url,
+        login="test",
+        password="123",
+        transport=httpx.MockTransport(timeout),
+        record=str(journal),
+    ) as client:
+        with pytest.raises(httpx.ReadTimeout):
+            await client.get_profile()
+    (entry,) = [json.loads(line) for line in journal.read_text().splitlines()]
+    assert entry["error"] == "ReadTimeout"
+    assert entry["message"] == "Test timeout error"
+    assert entry["elapsed"] >= 0
+    assert "status" not in entry and "content" not in entry
+
+    async with Client(
+        url=base_url,
+        login="test",
+        password="123",
+        transport=ReplayTransport(str(journal), time_scale=0),
+    ) as client:
+        with pytest.raises(httpx.ReadTimeout) as exc:
+            await client.get_profile()
+    assert str(exc.value) == "Test timeout error"
+
+
+@pytest.mark.asyncio
+async def test_replay(journal):
+    async with recording_client(journal) as client:
+        recorded = await client.get_messages()
+        with pytest.raises(ClientException):
+            await client.delete_message("1")
+
+    async with Client(
+        url=base_url,
+        login="test",
+        password="123",
+        transport=ReplayTransport(str(journal), time_scale=0),
+    ) as client:
+        for _ in range(2):
+            replayed = await client.get_messages()
+            assert replayed == recorded
+            assert isinstance(replayed[0], Message)
+        with pytest.raises(ClientException) as exc:
+            await client.delete_message("1")
+        assert exc.value.status == 404
+        with pytest.raises(httpx.ConnectError):
+            await client.get_profile()
+
+
+@pytest.mark.asyncio
+async def test_replay_timing(journal):
+    entry = {
+        "method": "GET",
+        "url": f"{base_url}/back/rapi2/v2/profile",
+        "status": 200,
+        "response_headers": [["content-type", "application/json"]],
+        "elapsed": 0.05,
+        "content": "e30=",
+    }
+    journal.write_text(json.dumps(entry) + "\n")
+    transport = ReplayTransport(str(journal), time_scale=2)
+    async with Client(
+        url=base_url, login="test", password="123", transport=transport
+    ) as client:
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await client.get_profile()
+        assert loop.time() - start >= 0.1
+
+
+@pytest.mark.asyncio
+async def test_recorded_stream_closes_once():
+    closed = []
+
+    async def on_close(body, _):
+        closed.append(body.tell())
+
+    stream = _RecordedStream(httpx.ByteStream(b"abc"), on_close)
+    assert [c async for c in stream] == [b"abc"]
+    await stream.aclose()
+    await stream.aclose()
+    assert closed == [3]
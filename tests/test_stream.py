@@ -0,0 +1,160 @@
+import json
+import time
+
+import httpx
+import pytest
+from conftest import base_url, messages_json, receipts_json
+from pytest_httpx import IteratorStream
+
+from cbr_client import (
+    CircuitBreaker,
+    Client,
+    ClientException,
+    Message,
+    Receipt,
+    _ArrayDecoder,
+)
+
+
+def chunked(data, size):
+    raw = json.dumps(data, ensure_ascii=False).encode()
+    return IteratorStream(
+        [raw[i : i + size] for i in range(0, len(raw), size)]
+    )
+
+
+def decode(text, size):
+    decoder = _ArrayDecoder()
+    items = []
+    for i in range(0, len(text), size):
+        items.extend(decoder.feed(text[i : i + size]))
+    return items + decoder.feed("", final=True)
+
+
+@pytest.mark.parametrize("size", (1, 3, 64, 10**6))
+@pytest.mark.parametrize(
+    "data",
+    (
+        [],
+        [1],
+        [12, -3.5, "a,]", None, True],
+        [{"a": [1, {"b": "]"}]}, [2]],
+        ['q"]}', {"b": '\\"{', "c": ["\\"]}],
+    ),
+)
+def test_array_decoder(data, size):
+    assert decode(json.dumps(data, indent=1), size) == data
+
+
+@pytest.mark.parametrize(
+    "text",
+    ("{}", "[1 2]", "[1, {", "[1,", "[1,]", "[1, ]", "[}]", "[{]}", '["a\\'),
+)
+@pytest.mark.parametrize("size", (2, 100))
+def test_array_decoder_invalid(text, size):
+    with pytest.raises(json.JSONDecodeError):
+        decode(text, size)
+
+
+def test_array_decoder_large_item():
+    files = [{"Name": f"file_{i}.xml", "Size": i} for i in range(50000)]
+    data = [{"Files": files, "Text": "x" * 10**6}, {"Files": files[:10]}]
+    text = json.dumps(data)
+    start = time.perf_counter()
+    assert decode(text, 4096) == data
+    assert time.perf_counter() - start < 30 * measure(json.loads, text)
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return max(time.perf_counter() - start, 0.01)
+
+
+@pytest.mark.asyncio
+async def test_iter_messages(httpx_mock, client):
+    httpx_mock.add_response(
+        stream=chunked(messages_json, 100),
+        headers={"Content-Type": "application/json"},
+        method="GET",
+        url=(
+            f"{base_url}/back/rapi2/{client.api_version}/messages"
+            f"?Page=2&Task=Zadacha_61"
+        ),
+    )
+    messages = [m async for m in client.iter_messages(form="1-ПИ", page=2)]
+    assert all(isinstance(m, Message) for m in messages)
+    assert messages == [Message(**m) for m in messages_json]
+
+
+@pytest.mark.asyncio
+async def test_iter_receipts(httpx_mock, client):
+    msg_id = "d66c4f1f-a6e5-4996-a6fb-fbb308135585"
+    httpx_mock.add_response(
+        stream=chunked(receipts_json, 7),
+        headers={"Content-Type": "application/json"},
+        method="GET",
+        url=(
+            f"{base_url}/back/rapi2/{client.api_version}"
+            f"/messages/{msg_id}/receipts"
+        ),
+    )
+    receipts = [r async for r in client.iter_receipts(msg_id)]
+    assert receipts == [Receipt(**r) for r in receipts_json]
+
+
+@pytest.mark.asyncio
+async def test_iter_messages_error(httpx_mock, client):
+    httpx_mock.add_response(
+        status_code=401,
+        json={
+            "HTTPStatus": 401,
+            "ErrorCode": "ACCOUNT_NOT_FOUND",
+            "ErrorMessage": "Аккаунт не найден",
+            "MoreInfo": {},
+        },
+        headers={"Content-Type": "application/json"},
+    )
+    with pytest.raises(ClientException) as exc:
+        async for _ in client.iter_messages():
+            pass
+    assert exc.value.status == 401
+
+
+@pytest.mark.asyncio
+async def test_iter_messages_timeout(httpx_mock):
+    def raise_timeout(request):
+        raise httpx.ReadTimeout("Test timeout error", request=request)
+
+    httpx_mock.add_callback(raise_timeout)
+    async with Client(
+        url=base_url,
+        login="test",
+        password="123",
+        circuit_breaker=CircuitBreaker(failures=1),
+    ) as client:
+        with pytest.raises(httpx.ReadTimeout):
+            async for _ in client.iter_messages():
+                pass
+        assert client.circuit_state() == {"messages": "open"}
+
+
+@pytest.mark.asyncio
+async def test_iter_messages_broken_body(httpx_mock):
+    class BrokenStream(httpx.AsyncByteStream):
+        async def __aiter__(self):
+            yield b"[{"
+            raise httpx.ReadError("Test read error")
+
+    httpx_mock.add_response(stream=BrokenStream())
+    async with Client(
+        url=base_url,
+        login="test",
+        password="123",
+        circuit_breaker=CircuitBreaker(failures=2),
+    ) as client:
+        with pytest.raises(httpx.ReadError):
+            async for _ in client.iter_messages():
+                pass
+        assert list(client._breakers["messages"]._results) == [False]
+        assert client.circuit_state() == {"messages": "closed"}